@@ -1,22 +1,110 @@
 import streamlit as st
-import pandas as pd
+import matplotlib
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from data import (load, downsample, sunburst_tree, alpha_sorted, signal_vs_realized, information_coefficient,
+                  frontier, sensitivity_pivot, contribution_table)
 
 st.set_page_config(layout="wide", page_title="Dashboard")
 
-@st.cache_data
-def load_data():
-    return (
-        pd.read_csv('raw_signals.csv', index_col=0),
-        pd.read_csv('correlation_matrix.csv', index_col=0),
-        pd.read_csv('stock_cumulative_returns.csv', index_col=0, parse_dates=True),
-        pd.read_csv('portfolio_performance.csv', index_col=0, parse_dates=True),
-        pd.read_csv('attribution_results.csv', index_col=0),
-        pd.read_csv('stock_details.csv', index_col=0),
-        pd.read_csv('parameter_search.csv')
-    )
+def fig_lines(df, columns, x_label, y_label):
+    fig = go.Figure()
+    for c in columns:
+        s = downsample(df[c])
+        fig.add_trace(go.Scattergl(x=s.index, y=s.to_numpy(), mode='lines', name=c, legendgroup=c,
+                                   hovertemplate=f'variable={c}<br>{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>'))
+    fig.update_layout(xaxis_title=x_label, yaxis_title=y_label, legend_title_text='variable')
+    return fig
+
+@st.cache_resource
+def fig_sunburst(values):
+    ids, parents, weights = sunburst_tree()
+    return go.Figure(go.Sunburst(ids=ids, labels=ids, parents=parents, values=weights[values], branchvalues='total',
+                                 hovertemplate='%{label}<br>' + values + '=%{value:.2%}<extra></extra>'))
+
+@st.cache_resource
+def fig_ic_scatter():
+    fig = go.Figure()
+    colors = pio.templates[pio.templates.default].layout.colorway
+    for i, (industry, g) in enumerate(signal_vs_realized().groupby('Industry', sort=False, observed=True)):
+        x, y = g['Alpha_Signal'].to_numpy(), g['Realized_Ret'].to_numpy()
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Scattergl(x=x, y=y, mode='markers', name=industry, legendgroup=industry,
+                                   marker_color=color, hovertext=g.index,
+                                   hovertemplate=f'<b>%{{hovertext}}</b><br><br>Industry={industry}<br>'
+                                                 'Expected Return (Alpha)=%{x}<br>Realized Return=%{y}<extra></extra>'))
+        ok = ~(np.isnan(x) | np.isnan(y))
+        xf, yf = x[ok], y[ok]
+        if len(np.unique(xf)) < 2:
+            continue
+        m, b = np.polyfit(xf, yf, 1)
+        xs = np.array([xf.min(), xf.max()])
+        fig.add_trace(go.Scatter(x=xs, y=m * xs + b, mode='lines', name=industry, legendgroup=industry,
+                                 line_color=color, showlegend=False, hoverinfo='skip'))
+    fig.update_layout(xaxis_title='Expected Return (Alpha)', yaxis_title='Realized Return', legend_title_text='Industry')
+    return fig
+
+@st.cache_resource
+def fig_stock_nav():
+    df_stock_nav = load('stock_cumulative_returns', 'Date_')
+    fig = fig_lines(df_stock_nav, df_stock_nav.columns, 'Date', 'NAV')
+    fig.update_layout(hovermode="x unified", legend=dict(orientation='h', y=1.05))
+    return fig
+
+@st.cache_resource
+def fig_alpha_bar():
+    df_sorted, order = alpha_sorted()
+    fig = px.bar(df_sorted, y='ID', x='Alpha_Signal', orientation='h', color='Industry')
+    fig.update_layout(yaxis=dict(categoryorder='array', categoryarray=order))
+    return fig
+
+@st.cache_resource
+def fig_corr():
+    df_corr = load('correlation_matrix', 'ID')
+    v = df_corr.to_numpy(np.float32)
+    fig = go.Figure(go.Heatmap(z=v, x=df_corr.columns, y=df_corr.index, texttemplate='%{z:.2f}',
+                               zmin=-1, zmax=1, colorscale='RdBu_r'))
+    fig.update_layout(height=700, xaxis=dict(scaleanchor='y', constrain='domain'),
+                      yaxis=dict(autorange='reversed', constrain='domain'))
+    return fig
+
+@st.cache_resource
+def fig_sensitivity(metric):
+    return px.imshow(sensitivity_pivot(metric), text_auto=".2f" if metric=='Sharpe' else ".2%", 
+                     color_continuous_scale='Viridis' if metric=='Sharpe' else 'RdYlGn',
+                     aspect="auto")
 
-df_sig, df_corr, df_stock_nav, df_perf, df_attr, df_stocks, df_params = load_data()
+@st.cache_resource
+def fig_frontier():
+    return px.scatter(frontier(), x='Active_Risk', y='Active_Return', 
+                      color='Sharpe', size='Sharpe', hover_data=['Gamma', 'Limit'],
+                      labels={'Active_Risk':'Tracking Error', 'Active_Return':'Alpha'})
+
+@st.cache_resource
+def fig_perf():
+    fig = fig_lines(load('portfolio_performance', 'Date_'), ['Benchmark', 'Original', 'Optimized', 'Naive_Alpha'],
+                    'Date_', 'value')
+    fig.update_layout(hovermode="x unified", title="NAV Comparison")
+    return fig
+
+@st.cache_resource
+def fig_alpha_evolution():
+    return px.area(downsample(load('portfolio_performance', 'Date_')['Alpha_Evolution']).to_frame(), y='Alpha_Evolution')
+
+@st.cache_resource
+def fig_attribution():
+    return px.bar(load('attribution_results', 'Sector').reset_index(), x='Sector', y=['Selection', 'Allocation', 'Interaction'],
+                  barmode='group', title="Decomposition of Excess Return")
+
+def contribution_colors(s, vmin=-0.01, vmax=0.01):
+    rgb = matplotlib.colormaps['RdYlGn'](matplotlib.colors.Normalize(vmin=vmin, vmax=vmax)(s.to_numpy()))[:, :3]
+    lin = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    dark = lin @ np.array([0.2126, 0.7152, 0.0722]) < 0.408
+    return [f"background-color: #{r:02x}{g:02x}{b:02x}; color: {'#f1f1f1' if d else '#000000'}"
+            for (r, g, b), d in zip((rgb * 255).round().astype(np.uint8).tolist(), dark)]
 
 st.title("Visualization Dashboard")
 st.divider()
@@ -27,95 +115,61 @@ with t1:
     st.subheader("Weight Distribution")
     
     st.write("**Weight: Sector > Stock (Click to Drill-Down)**")
-    df_weights = pd.read_csv('PortfolioBenchmarkWeights.csv').merge(df_sig[['Industry']], left_on='ID', right_index=True)
     
     col1, col2 = st.columns(2)
     with col1:
         st.caption("Benchmark Structure")
-        fig = px.sunburst(df_weights, path=['Industry', 'ID'], values='WeightBm', 
-                         color='Industry', 
-                         hover_data={'WeightBm': ':.2%', 'ID': True, 'Industry': True})
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_sunburst('WeightBm'), use_container_width=True)
     with col2:
         st.caption("Original Portfolio Structure")
-        fig = px.sunburst(df_weights, path=['Industry', 'ID'], values='WeightPf', 
-                         color='Industry',
-                         hover_data={'WeightPf': ':.2%', 'ID': True, 'Industry': True})
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_sunburst('WeightPf'), use_container_width=True)
 
     st.divider()
 
     st.write("**Alpha Signal: Expected vs. Realized Returns**")
-    df_ic = df_sig[['Alpha_Signal', 'Industry']].merge(df_stocks[['Realized_Ret']], left_index=True, right_index=True)
-    ic = df_ic['Alpha_Signal'].corr(df_ic['Realized_Ret'])
-    st.metric("Information Coefficient (IC)", f"{ic:.3f}")
+    st.metric("Information Coefficient (IC)", f"{information_coefficient():.3f}")
     
-    fig = px.scatter(df_ic.reset_index(), x='Alpha_Signal', y='Realized_Ret', trendline="ols", 
-                    color='Industry', hover_name='ID',
-                    labels={'Alpha_Signal': 'Expected Return (Alpha)', 'Realized_Ret': 'Realized Return'})
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig_ic_scatter(), use_container_width=True)
 
     st.divider()
 
     col1, col2 = st.columns([1.2, 0.8])
     with col1:
         st.write("**Asset Cumulative Returns**")
-        fig = px.line(df_stock_nav, labels={'value': 'NAV', 'Date_': 'Date'})
-        fig.update_layout(hovermode="x unified", legend=dict(orientation='h', y=1.05))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_stock_nav(), use_container_width=True)
     with col2:
         st.write("**Alpha Signal (Expected Return)**")
-        df_sorted = df_sig.sort_values('Alpha_Signal', ascending=True).reset_index()
-        fig = px.bar(df_sorted, y='ID', x='Alpha_Signal', orientation='h', color='Industry')
-        fig.update_layout(yaxis=dict(categoryorder='array', categoryarray=df_sorted['ID'].tolist()))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_alpha_bar(), use_container_width=True)
 
     st.divider()
     st.write("**Correlation Matrix**")
-    fig = px.imshow(df_corr, color_continuous_scale='RdBu_r', zmin=-1, zmax=1, text_auto=".2f")
-    fig.update_layout(height=700)
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig_corr(), use_container_width=True)
 
 with t2:
     st.subheader("Parameter Sensitivity")
     
     metric = st.radio("Select Metric:", ['Sharpe', 'Active_Return'], horizontal=True)
-    df_filtered = df_params[df_params['Lambda'] < 0.0001]
-    
-    pivot = df_filtered.pivot(index='Gamma', columns='Limit', values=metric)
-    st.plotly_chart(px.imshow(pivot, text_auto=".2f" if metric=='Sharpe' else ".2%", 
-                             color_continuous_scale='Viridis' if metric=='Sharpe' else 'RdYlGn',
-                             aspect="auto"), use_container_width=True)
+    st.plotly_chart(fig_sensitivity(metric), use_container_width=True)
     
     st.divider()
     st.write("**Active Frontier (Risk vs. Return)**")
-    st.plotly_chart(px.scatter(df_filtered, x='Active_Risk', y='Active_Return', 
-                              color='Sharpe', size='Sharpe', hover_data=['Gamma', 'Limit'],
-                              labels={'Active_Risk':'Tracking Error', 'Active_Return':'Alpha'}), 
-                   use_container_width=True)
+    st.plotly_chart(fig_frontier(), use_container_width=True)
 
 with t3:
     st.subheader("Performance vs Benchmark & Naive Alpha")
-    fig = px.line(df_perf[['Benchmark', 'Original', 'Optimized', 'Naive_Alpha']])
-    fig.update_layout(hovermode="x unified", title="NAV Comparison")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig_perf(), use_container_width=True)
     
     st.write("**Cumulative Active Return**")
-    fig = px.area(df_perf, y='Alpha_Evolution')
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig_alpha_evolution(), use_container_width=True)
 
 with t4:
     st.subheader("Brinson-Fachler Attribution (Industry Level)")
-    fig = px.bar(df_attr.reset_index(), x='Sector', y=['Selection', 'Allocation', 'Interaction'],
-                barmode='group', title="Decomposition of Excess Return")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig_attribution(), use_container_width=True)
     
     st.divider()
     st.subheader("Stock-level Contribution Details")
-    df_disp = df_stocks.reset_index()
+    df_disp = contribution_table()
     id_col = 'ID'
-    df_disp['Position'] = df_disp['Active_Weight'].gt(0).map({True: "Overweight", False: "Underweight"})
-    df_disp = df_disp.sort_values('Contribution', ascending=False)
 
     st.dataframe(
         df_disp[[id_col, 'Industry', 'Position', 'Active_Weight', 'Realized_Ret', 'Contribution']]
@@ -124,6 +178,6 @@ with t4:
             'Realized_Ret': '{:.2%}',
             'Contribution': '{:+.4%}'
         })
-        .background_gradient(subset=['Contribution'], cmap='RdYlGn', vmin=-0.01, vmax=0.01),
+        .apply(contribution_colors, subset=['Contribution']),
         use_container_width=True
     )
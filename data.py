@@ -0,0 +1,69 @@
+import streamlit as st
+import numpy as np
+import polars as pl
+from tsdownsample import LTTBDownsampler
+
+@st.cache_resource
+def tables():
+    return {name: pl.scan_parquet(f'{name}.parquet') for name in [
+        'raw_signals', 'correlation_matrix', 'stock_cumulative_returns', 'portfolio_performance',
+        'attribution_results', 'stock_details', 'parameter_search', 'PortfolioBenchmarkWeights'
+    ]}
+
+@st.cache_data
+def load(name, index=None, columns=None):
+    q = tables()[name]
+    if columns is not None:
+        q = q.select(([index] if index else []) + columns)
+    df = q.with_columns(pl.col(pl.Float64).cast(pl.Float32), pl.col('^Industry$').cast(pl.Categorical)).collect().to_pandas()
+    return df.set_index(index) if index else df
+
+def downsample(s, n_out=2000, threshold=5000):
+    if len(s) <= threshold:
+        return s
+    return s.iloc[LTTBDownsampler().downsample(s.index.to_numpy().view('int64'), s.to_numpy(), n_out=n_out)]
+
+@st.cache_data
+def weights_by_industry():
+    df = load('PortfolioBenchmarkWeights', columns=['ID', 'WeightPf', 'WeightBm'])
+    return df.assign(Industry=df['ID'].map(load('raw_signals', 'ID', ['Industry'])['Industry'])).dropna(subset=['Industry'])
+
+@st.cache_data
+def sunburst_tree():
+    df = weights_by_industry().astype({'WeightBm': 'float64', 'WeightPf': 'float64'})
+    agg = df.groupby('Industry', observed=True)[['WeightBm', 'WeightPf']].sum()
+    ids = np.concatenate([agg.index.astype(str), df['ID'].astype(str)])
+    parents = np.concatenate([np.full(len(agg), ''), df['Industry'].astype(str)])
+    values = {c: np.concatenate([agg[c].to_numpy(), df[c].to_numpy()]) for c in ['WeightBm', 'WeightPf']}
+    return ids, parents, values
+
+@st.cache_data
+def alpha_sorted():
+    df = load('raw_signals', 'ID', ['Alpha_Signal', 'Industry']).sort_values('Alpha_Signal').reset_index()
+    return df, df['ID'].to_numpy()
+
+@st.cache_data
+def signal_vs_realized():
+    return load('raw_signals', 'ID', ['Alpha_Signal', 'Industry']).merge(
+        load('stock_details', 'ID', ['Realized_Ret']), left_index=True, right_index=True)
+
+@st.cache_data
+def information_coefficient():
+    df_ic = signal_vs_realized()
+    a, r = df_ic['Alpha_Signal'].to_numpy(), df_ic['Realized_Ret'].to_numpy()
+    ok = ~(np.isnan(a) | np.isnan(r))
+    return float(np.corrcoef(a[ok], r[ok])[0, 1])
+
+@st.cache_data
+def frontier():
+    return tables()['parameter_search'].filter(pl.col('Lambda') < 0.0001).collect()
+
+@st.cache_data
+def sensitivity_pivot(metric):
+    return frontier().to_pandas().pivot(index='Gamma', columns='Limit', values=metric)
+
+@st.cache_data
+def contribution_table():
+    df = load('stock_details', 'ID', ['Realized_Ret', 'Active_Weight', 'Contribution', 'Industry']).reset_index()
+    df['Position'] = np.where(df['Active_Weight'].to_numpy() > 0, "Overweight", "Underweight")
+    return df.sort_values('Contribution', ascending=False)